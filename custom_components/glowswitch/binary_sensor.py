@@ -5,7 +5,7 @@ import logging
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -18,6 +18,10 @@ from .entity import GenericBTEntity # Updated import
 _LOGGER = logging.getLogger(__name__)
 PARALLEL_UPDATES = 0
 
+# Resolve the compiled schemas once at import instead of per setup call.
+_WRITE_GATT_SCHEMA = Schema.WRITE_GATT.value
+_READ_GATT_SCHEMA = Schema.READ_GATT.value
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up GlowSwitch device based on a config entry.""" # Docstring can remain
@@ -25,8 +29,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities([GenericBTBinarySensor(coordinator)]) # Updated class name
 
     platform = entity_platform.async_get_current_platform()
-    platform.async_register_entity_service("write_gatt", Schema.WRITE_GATT.value, "write_gatt")
-    platform.async_register_entity_service("read_gatt", Schema.READ_GATT.value, "read_gatt")
+    platform.async_register_entity_service("write_gatt", _WRITE_GATT_SCHEMA, "write_gatt")
+    platform.async_register_entity_service("read_gatt", _READ_GATT_SCHEMA, "read_gatt")
 
 
 class GenericBTBinarySensor(GenericBTEntity, BinarySensorEntity): # Updated class name and base class
@@ -37,13 +41,20 @@ class GenericBTBinarySensor(GenericBTEntity, BinarySensorEntity): # Updated clas
     def __init__(self, coordinator: GenericBTCoordinator) -> None: # Updated type hint
         """Initialize the Device."""
         super().__init__(coordinator)
+        self._attr_is_on = coordinator.device.connected
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to connection state changes pushed by the device."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._device.register_connection_callback(self._handle_connection_change))
 
-    @property
-    def is_on(self):
-        return self._device.connected
+    @callback
+    def _handle_connection_change(self, connected: bool) -> None:
+        self._attr_is_on = connected
+        self.async_write_ha_state()
 
-    async def write_gatt(self, target_uuid, data):
-        await self._device.write_gatt(target_uuid, data)
+    async def write_gatt(self, target_uuid, data, response: bool = False):
+        await self._device.write_gatt(target_uuid, data, response)
         self.async_write_ha_state()
 
     async def read_gatt(self, target_uuid):
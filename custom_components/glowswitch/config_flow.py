@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from bleak_retry_connector import BLEAK_EXCEPTIONS
 from bluetooth_data_tools import human_readable_name
 import voluptuous as vol
 
@@ -20,6 +21,20 @@ _LOGGER = logging.getLogger(__name__)
 GLOWDIM_SERVICE_UUID = "12345678-1234-5678-1234-56789abcdefA"
 GLOWSWITCH_SERVICE_UUID = "12345678-1234-5678-1234-56789abcdef0"
 
+# Lowered once at import so per-advertisement sniffing does not re-lower them.
+_GLOWDIM_UUID_LOWER = GLOWDIM_SERVICE_UUID.lower()
+_GLOWSWITCH_UUID_LOWER = GLOWSWITCH_SERVICE_UUID.lower()
+
+_MATCH_PREFIXES = ("glowswitch", "glowdim")
+_MATCH_UUIDS = {_GLOWDIM_UUID_LOWER, _GLOWSWITCH_UUID_LOWER}
+
+
+def _is_supported(discovery: BluetoothServiceInfoBleak) -> bool:
+    """Cheap predicate to keep unrelated BLE devices out of the pick list."""
+    if (discovery.name or "").lower().startswith(_MATCH_PREFIXES):
+        return True
+    return any(str(s).lower() in _MATCH_UUIDS for s in discovery.service_uuids)
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for GlowSwitch."""
 
@@ -28,7 +43,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize the config flow."""
         self._discovery_info: BluetoothServiceInfoBleak | None = None
-        self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
+        # Maps address -> (discovery info, pre-formatted pick-list label).
+        self._discovered_devices: dict[str, tuple[BluetoothServiceInfoBleak, str]] = {}
 
     async def async_step_bluetooth(self, discovery_info: BluetoothServiceInfoBleak) -> FlowResult:
         """Handle the bluetooth discovery step."""
@@ -43,6 +59,21 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # based on the chosen or current discovery_info.
         return await self.async_step_user()
 
+    def _refresh_discovered(self) -> None:
+        """Populate _discovered_devices in a single pass over HA's discovery list."""
+        if self._discovery_info:
+            self._add_discovered(self._discovery_info)
+        current_addresses = self._async_current_ids()
+        for discovery in async_discovered_service_info(self.hass):
+            if discovery.address in current_addresses or not _is_supported(discovery):
+                continue
+            self._add_discovered(discovery)
+
+    def _add_discovered(self, discovery: BluetoothServiceInfoBleak) -> None:
+        """Record a discovery, formatting its pick-list label exactly once."""
+        if discovery.address not in self._discovered_devices:
+            self._discovered_devices[discovery.address] = (discovery, f"{discovery.name} ({discovery.address})")
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> FlowResult:
         """Handle the user step to pick discovered device."""
         errors: dict[str, str] = {}
@@ -50,22 +81,25 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             address = user_input[CONF_ADDRESS]
-            processed_discovery_info = self._discovered_devices[address] # Use this for the selected device
+            processed_discovery_info = self._discovered_devices[address][0] # Use this for the selected device
         elif self._discovery_info:
             # Came directly from bluetooth discovery
             processed_discovery_info = self._discovery_info
             # Ensure it's in _discovered_devices for consistency if we show form again
-            self._discovered_devices[processed_discovery_info.address] = processed_discovery_info
+            self._add_discovered(processed_discovery_info)
 
         if processed_discovery_info:
             local_name = processed_discovery_info.name # Used for the title
             device_type = "glowswitch" # Default device type
 
-            if processed_discovery_info.advertisement and processed_discovery_info.advertisement.service_uuids:
-                service_uuids_lower = [str(s).lower() for s in processed_discovery_info.advertisement.service_uuids]
-                if GLOWDIM_SERVICE_UUID.lower() in service_uuids_lower:
+            # Classify from the service info's own UUID list, the same field
+            # _is_supported matches on.
+            for service_uuid in processed_discovery_info.service_uuids:
+                lowered = str(service_uuid).lower()
+                if lowered == _GLOWDIM_UUID_LOWER:
                     device_type = "glowdim"
-                elif GLOWSWITCH_SERVICE_UUID.lower() in service_uuids_lower:
+                    break
+                if lowered == _GLOWSWITCH_UUID_LOWER:
                     device_type = "glowswitch"
             # If neither specific UUID is found, it remains the default "glowswitch".
 
@@ -90,37 +124,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                             "device_type": device_type, # Add device_type here
                         }
                     )
-        # Fallback to populate _discovered_devices if empty or if no specific device processed yet
-        if not self._discovered_devices and not processed_discovery_info:
-            current_addresses = self._async_current_ids()
-            for discovery_in_list in async_discovered_service_info(self.hass): # renamed discovery to discovery_in_list
-                if (
-                    discovery_in_list.address in current_addresses
-                    or discovery_in_list.address in self._discovered_devices
-                ):
-                    continue
-                self._discovered_devices[discovery_in_list.address] = discovery_in_list
-
-        if discovery := self._discovery_info: # Keep this to add initial discovery to the list if not already processed
-            if discovery.address not in self._discovered_devices:
-                 self._discovered_devices[discovery.address] = discovery
-        # else: # This else block might be problematic if processed_discovery_info was set from self._discovery_info
-        # The logic for populating _discovered_devices for the form needs to be robust
-        # Ensure _discovered_devices is populated for the form if we haven't created an entry or aborted
-        if not user_input and not errors: # only populate from scratch if not handling a submission
-            # This part populates the list for the user to choose from
-            current_addresses = self._async_current_ids()
-            # Check if self._discovery_info (if any) is already added
-            if self._discovery_info and self._discovery_info.address not in self._discovered_devices:
-                self._discovered_devices[self._discovery_info.address] = self._discovery_info
-
-            for discovery_in_list in async_discovered_service_info(self.hass):
-                if (
-                    discovery_in_list.address in current_addresses
-                    or discovery_in_list.address in self._discovered_devices
-                ):
-                    continue
-                self._discovered_devices[discovery_in_list.address] = discovery_in_list
+        # Falling through to (re)show the form: refresh the candidate list once.
+        self._refresh_discovered()
 
         if not self._discovered_devices:
             return self.async_abort(reason="no_devices_found")
@@ -130,8 +135,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             {
                 vol.Required(CONF_ADDRESS): vol.In(
                     {
-                        service_info.address: (f"{service_info.name} ({service_info.address})")
-                        for service_info in self._discovered_devices.values() # Ensure this is populated
+                        address: label
+                        for address, (_, label) in self._discovered_devices.items()
                     }
                 ),
             }
@@ -14,7 +14,8 @@ class Schema(Enum):
     WRITE_GATT = make_entity_service_schema(
         {
             vol.Required("target_uuid"): cv.string,
-            vol.Required("data"): cv.string
+            vol.Required("data"): vol.All(cv.string, vol.Match(r"^(?:[0-9A-Fa-f]{2})+$")),
+            vol.Optional("response", default=False): cv.boolean
         }
     )
     READ_GATT = make_entity_service_schema(
@@ -7,7 +7,7 @@ import logging
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.active_update_coordinator import ActiveBluetoothDataUpdateCoordinator
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr # Added import
 from bleak.backends.device import BLEDevice
 
@@ -40,18 +40,9 @@ class GenericBTCoordinator(ActiveBluetoothDataUpdateCoordinator[None]): # Rename
 
     @callback
     def _needs_poll(self, service_info: bluetooth.BluetoothServiceInfoBleak, seconds_since_last_poll: float | None) -> bool:
-        # Only poll if hass is running, we need to poll,
-        # and we actually have a way to connect to the device
+        # device.update() performs no characteristic reads, so polling would
+        # be pure connect/lock overhead on every advertisement; skip it.
         return False
-        return (
-            self.hass.state == CoreState.running
-            and self.device.poll_needed(seconds_since_last_poll)
-            and bool(
-                bluetooth.async_ble_device_from_address(
-                    self.hass, service_info.device.address, connectable=True
-                )
-            )
-        )
 
     async def _async_update(self, service_info: bluetooth.BluetoothServiceInfoBleak) -> None:
         """Poll the device."""
@@ -67,7 +58,7 @@ class GenericBTCoordinator(ActiveBluetoothDataUpdateCoordinator[None]): # Rename
     def _async_handle_bluetooth_event(self, service_info: bluetooth.BluetoothServiceInfoBleak, change: bluetooth.BluetoothChange) -> None:
         """Handle a Bluetooth event."""
         self.ble_device = service_info.device
-        _LOGGER.debug(f"{DOMAIN} - _async_handle_bluetooth_event - {service_info} - {self.ble_device}")
+        _LOGGER.debug("%s - _async_handle_bluetooth_event - %s - %s", DOMAIN, service_info, self.ble_device)
         self._ready_event.set()
 
         if not self._was_unavailable:
@@ -1,63 +1,250 @@
 """generic bt device"""
 
+from collections.abc import Callable
+from functools import lru_cache
 from uuid import UUID
 import asyncio
 import logging
-from contextlib import AsyncExitStack
 
 from bleak import BleakClient
+from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.exc import BleakError
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 
 _LOGGER = logging.getLogger(__name__)
 
+CONNECT_TIMEOUT = 30
+
+# How long an idle connection is kept alive for reuse before being released.
+# Commands arriving within this window skip connection setup entirely;
+# afterwards the link is dropped so the radio is free for other devices.
+DISCONNECT_DELAY = 30
+
+
+@lru_cache(maxsize=256)
+def _to_uuid(target_uuid: str) -> UUID:
+    """Parse a GATT UUID string, cached so hot read/write paths skip re-parsing."""
+    return UUID(target_uuid)
+
+
+@lru_cache(maxsize=64)
+def _hex_to_bytes(data: str) -> bytes:
+    """Decode a hex payload, cached since switch command payloads repeat."""
+    return bytes.fromhex(data)
+
+
+class _Hex:
+    """Lazily hex-format bytes, so debug logs only pay for it when emitted."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    def __str__(self) -> str:
+        return self._data.hex()
+
 
 class GenericBTDevice:
     """Generic BT Device Class"""
     def __init__(self, ble_device):
         self._ble_device = ble_device
         self._client: BleakClient | None = None
-        self._client_stack = AsyncExitStack()
+        self._is_connected = False
         self._lock = asyncio.Lock()
+        self._char_cache: dict[UUID, BleakGATTCharacteristic] = {}
+        self._force_response: frozenset[UUID] = frozenset()
+        self._connection_callbacks: list[Callable[[bool], None]] = []
+        self._last_advertisement = None
+        self._pending_writes: list[tuple[UUID, bytes, bool, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._disconnect_timer: asyncio.TimerHandle | None = None
+        self._disconnect_task: asyncio.Task | None = None
 
     async def update(self):
         pass
 
     async def stop(self):
-            pass
+        self._cancel_disconnect_timer()
+        if self._client is not None:
+            client = self._client
+            self._client = None
+            self._is_connected = False
+            self._char_cache.clear()
+            self._notify_connection()
+            await client.disconnect()
 
     @property
     def connected(self):
-        return not self._client is None
+        return self._is_connected
+
+    def register_connection_callback(self, callback: Callable[[bool], None]) -> Callable[[], None]:
+        """Subscribe to connection state changes; returns an unsubscribe callable."""
+        self._connection_callbacks.append(callback)
+
+        def unregister() -> None:
+            self._connection_callbacks.remove(callback)
+
+        return unregister
+
+    def _notify_connection(self) -> None:
+        for callback in self._connection_callbacks:
+            callback(self._is_connected)
+
+    def _cancel_disconnect_timer(self) -> None:
+        if self._disconnect_timer is not None:
+            self._disconnect_timer.cancel()
+            self._disconnect_timer = None
+
+    def _reset_disconnect_timer(self) -> None:
+        """(Re)arm the idle-disconnect timer; called whenever the link is used."""
+        self._cancel_disconnect_timer()
+        self._disconnect_timer = asyncio.get_running_loop().call_later(
+            DISCONNECT_DELAY, self._idle_disconnect
+        )
+
+    def _idle_disconnect(self) -> None:
+        self._disconnect_timer = None
+        _LOGGER.debug("Disconnecting after %s seconds idle", DISCONNECT_DELAY)
+        self._disconnect_task = asyncio.get_running_loop().create_task(self.stop())
+
+    def _on_disconnect(self, client: BleakClient) -> None:
+        """Handle the peripheral dropping the link; reconnect lazily on next use."""
+        _LOGGER.debug("Disconnected")
+        self._cancel_disconnect_timer()
+        self._is_connected = False
+        self._client = None
+        self._char_cache.clear()
+        self._notify_connection()
 
     async def get_client(self):
+        # Fast path: connection state is tracked locally via the
+        # disconnected_callback, so reuse is a plain attribute read instead
+        # of an is_connected probe (a D-Bus round trip on BlueZ).
+        client = self._client
+        if self._is_connected and client is not None:
+            _LOGGER.debug("Connection reused")
+            self._reset_disconnect_timer()
+            return client
         async with self._lock:
-            if not self._client:
-                _LOGGER.debug("Connecting")
-                try:
-                    self._client = await self._client_stack.enter_async_context(BleakClient(self._ble_device, timeout=30))
-                except asyncio.TimeoutError as exc:
-                    _LOGGER.debug("Timeout on connect", exc_info=True)
-                    raise IdealLedTimeout("Timeout on connect") from exc
-                except BleakError as exc:
-                    _LOGGER.debug("Error on connect", exc_info=True)
-                    raise IdealLedBleakError("Error on connect") from exc
-            else:
+            client = self._client
+            if self._is_connected and client is not None:
                 _LOGGER.debug("Connection reused")
+                self._reset_disconnect_timer()
+                return client
+            _LOGGER.debug("Connecting")
+            try:
+                # Bound the whole connect sequence so a stuck attempt cannot
+                # hold the lock indefinitely and block later GATT ops.
+                async with asyncio.timeout(CONNECT_TIMEOUT):
+                    client = await establish_connection(
+                        BleakClientWithServiceCache,
+                        self._ble_device,
+                        self._ble_device.address,
+                        disconnected_callback=self._on_disconnect,
+                        use_services_cache=True,
+                        max_attempts=3,
+                    )
+            except asyncio.TimeoutError:
+                _LOGGER.debug("Timeout on connect", exc_info=True)
+                raise
+            except BleakError:
+                _LOGGER.debug("Error on connect", exc_info=True)
+                raise
+            self._client = client
+            self._is_connected = True
+            # Resolve characteristics once per connection so read/write can
+            # hand Bleak the object directly instead of a per-call UUID lookup.
+            self._char_cache = {
+                UUID(char.uuid): char
+                for service in client.services
+                for char in service.characteristics
+            }
+            # Characteristics that only accept write-with-response, resolved
+            # once here so each write is a set lookup instead of a
+            # properties scan.
+            self._force_response = frozenset(
+                uuid
+                for uuid, char in self._char_cache.items()
+                if "write-without-response" not in char.properties
+            )
+            self._notify_connection()
+            self._reset_disconnect_timer()
+            return client
+
+    async def write_gatt(self, target_uuid, data, response: bool = False):
+        # Callers may pass pre-built payload bytes; only decode hex strings.
+        data_as_bytes = data if isinstance(data, (bytes, bytearray)) else _hex_to_bytes(data)
+        # Likewise a pre-parsed UUID skips the parse entirely.
+        uuid = target_uuid if isinstance(target_uuid, UUID) else _to_uuid(target_uuid)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending_writes.append((uuid, data_as_bytes, response, future))
+        if self._flush_handle is None:
+            # Coalesce writes issued within the same short window so a
+            # single connection event covers all of them back-to-back.
+            self._flush_handle = loop.call_later(0.005, self._schedule_flush)
+        await future
 
-    async def write_gatt(self, target_uuid, data):
-        await self.get_client()
-        uuid_str = "{" + target_uuid + "}"
-        uuid = UUID(uuid_str)
-        data_as_bytes = bytearray.fromhex(data)
-        await self._client.write_gatt_char(uuid, data_as_bytes, True)
+    def _schedule_flush(self) -> None:
+        self._flush_handle = None
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_writes())
+
+    async def _flush_writes(self) -> None:
+        pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            # A write enqueued while a flush task was still pending got
+            # consumed by that flush; don't connect just to send nothing.
+            return
+        try:
+            client = await self.get_client()
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        # A slider drag can queue many writes to the same characteristic in
+        # one window; these devices are state-setting, so only the latest
+        # value needs to reach the radio. Superseded writes share the
+        # outcome of the one that is actually sent.
+        latest: dict[UUID, tuple[bytes, bool]] = {}
+        waiters: dict[UUID, list[asyncio.Future]] = {}
+        for uuid, data_as_bytes, response, future in pending:
+            latest[uuid] = (data_as_bytes, response)
+            waiters.setdefault(uuid, []).append(future)
+        for uuid, (data_as_bytes, response) in latest.items():
+            try:
+                char = self._char_cache.get(uuid)
+                if not response and uuid in self._force_response:
+                    # Honour characteristics that only accept write-with-response.
+                    response = True
+                # Bleak serializes GATT ops at the backend layer, so no
+                # Python-side lock is needed around the write itself.
+                await client.write_gatt_char(char or uuid, data_as_bytes, response)
+            except Exception as exc:  # pylint: disable=broad-except
+                for future in waiters[uuid]:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for future in waiters[uuid]:
+                    if not future.done():
+                        future.set_result(None)
 
     async def read_gatt(self, target_uuid):
-        await self.get_client()
-        uuid_str = "{" + target_uuid + "}"
-        uuid = UUID(uuid_str)
-        data = await self._client.read_gatt_char(uuid)
-        print(data)
+        uuid = _to_uuid(target_uuid)
+        client = await self.get_client()
+        data = await client.read_gatt_char(self._char_cache.get(uuid) or uuid)
+        _LOGGER.debug("read %s: %s", uuid, _Hex(data))
         return data
 
     def update_from_advertisement(self, advertisement):
-        pass
+        # Advertisements can arrive at several hertz per adapter; never tear
+        # down a live connection for one, and skip all work for repeats.
+        if advertisement is self._last_advertisement:
+            return
+        self._last_advertisement = advertisement
+        if not self._is_connected:
+            # Characteristic handles may not survive a transport change
+            # (e.g. a proxy switchover); re-resolve on the next connect.
+            self._char_cache.clear()
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any # Added for **kwargs
+import random
+from typing import Any, Final # Added for **kwargs
+from uuid import UUID
+
+from bleak.exc import BleakError
 
 from homeassistant.components.light import ColorMode, LightEntity, LightEntityFeature, ATTR_BRIGHTNESS
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import DOMAIN
 from .coordinator import GenericBTCoordinator # Changed import
@@ -14,6 +21,22 @@ from .entity import GenericBTEntity # Changed import
 
 _LOGGER = logging.getLogger(__name__)
 
+# The single command characteristic both device types expose, pre-parsed so
+# no per-write UUID string parsing happens downstream.
+_CHAR_UUID: Final = UUID("12345678-1234-5678-1234-56789abcdef1")
+
+# Capped backoff schedule for transient BLE failures; total budget stays
+# around one second so HA's service-call timeout is never approached.
+_RETRY_DELAYS: Final = (0, 0.05, 0.2, 0.8)
+
+# Command payloads as bytes singletons so no per-write hex decoding happens.
+_PAYLOAD_ON: Final = b"\x01"
+_PAYLOAD_OFF: Final = b"\x00"
+
+# HA brightness (0-255) -> device brightness (0-100) as a one-byte payload,
+# tabulated once at import so turn_on is a plain index.
+_BRIGHTNESS_PAYLOAD = tuple(bytes([max(0, min(100, round(i / 255 * 100)))]) for i in range(256))
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -22,9 +45,9 @@ async def async_setup_entry(
     coordinator: GenericBTCoordinator = hass.data[DOMAIN][entry.entry_id] # Changed type hint
     async_add_entities([GenericBTLight(coordinator, entry)]) # Renamed class
 
-class GenericBTLight(GenericBTEntity, LightEntity): # Renamed class and inheritance
-    # _attr_supported_features removed to rely on defaults for a basic on/off light
+class GenericBTLight(GenericBTEntity, LightEntity, RestoreEntity): # Renamed class and inheritance
     _attr_name = "GlowSwitch Light" # Name can remain
+    _attr_supported_features = LightEntityFeature(0)
 
     def __init__(self, coordinator: GenericBTCoordinator, entry: ConfigEntry) -> None: # Changed type hint
         super().__init__(coordinator)
@@ -34,26 +57,31 @@ class GenericBTLight(GenericBTEntity, LightEntity): # Renamed class and inherita
         self._device_type = entry.data.get("device_type", "glowswitch") # Default to glowswitch if not set
         self._is_on = None # Or False by default
         self._brightness = 255 if self._device_type == "glowdim" else None # HA brightness 0-255
+        self._inflight: dict[tuple[bytes, bool], asyncio.Task] = {}
 
-    @property
-    def supported_features(self) -> LightEntityFeature:
-        """Flag supported features."""
-        # BRIGHTNESS is handled by color_modes. Other features like EFFECT could be added here.
-        return LightEntityFeature(0)
-
-    @property
-    def supported_color_modes(self) -> set[ColorMode]:
-        """Return the set of supported color modes."""
-        if self._device_type == "glowdim":
-            return {ColorMode.BRIGHTNESS}
-        return {ColorMode.ONOFF}
-
-    @property
-    def color_mode(self) -> ColorMode:
-        """Return the current color mode of the light."""
+        # Color modes never change for a given entity; set them once so HA
+        # reads plain attributes instead of invoking properties per refresh.
         if self._device_type == "glowdim":
-            return ColorMode.BRIGHTNESS
-        return ColorMode.ONOFF
+            self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+            self._attr_color_mode = ColorMode.BRIGHTNESS
+        else:
+            self._attr_supported_color_modes = {ColorMode.ONOFF}
+            self._attr_color_mode = ColorMode.ONOFF
+
+        # Name and device type are fixed; format the log prefix once instead
+        # of per debug call on the write path.
+        self._log_prefix = f"{self._attr_name} ({self._device_type})"
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known state so no BLE probe is needed at startup."""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_state()
+        # Only adopt a definite on/off state; restoring unknown/unavailable
+        # as "off" would make the no-op short-circuits skip real commands.
+        if last is not None and last.state in (STATE_ON, STATE_OFF):
+            self._is_on = last.state == STATE_ON
+            if self._device_type == "glowdim":
+                self._brightness = last.attributes.get(ATTR_BRIGHTNESS, self._brightness)
 
     @property
     def brightness(self) -> int | None:
@@ -69,42 +97,64 @@ class GenericBTLight(GenericBTEntity, LightEntity): # Renamed class and inherita
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the light on."""
-        try:
-            if self._device_type == "glowdim":
-                ha_brightness = kwargs.get(ATTR_BRIGHTNESS)
-                if ha_brightness is not None:
-                    self._brightness = ha_brightness
-                # If self._brightness is None (e.g. first turn_on and not specified), default to full.
-                # self._brightness should have been initialized to 255 for glowdim.
-                current_ha_brightness = self._brightness if self._brightness is not None else 255
-
-                # Convert HA brightness (0-255) to device brightness (0-100)
-                device_brightness_value = round(current_ha_brightness / 255 * 100)
-                # Ensure value is within 0-100 range
-                device_brightness_value = max(0, min(100, device_brightness_value))
-                hex_data = f"{device_brightness_value:02x}"
-                _LOGGER.debug(f"Turning on {self.name} ({self._device_type}) to brightness {current_ha_brightness}/255 -> device value {device_brightness_value}/100 -> hex string {hex_data}")
-                await self._device.write_gatt("12345678-1234-5678-1234-56789abcdef1", hex_data)
-            else: # glowswitch
-                _LOGGER.debug(f"Turning on {self.name} ({self._device_type})")
-                await self._device.write_gatt("12345678-1234-5678-1234-56789abcdef1", "01")
-
-            self._is_on = True
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error(f"Error turning on light {self.name}: {e}")
+        # Re-fired commands (automations, UI double-taps) that change nothing
+        # can skip the BLE round trip entirely.
+        if self._is_on is True and (self._device_type != "glowdim" or kwargs.get(ATTR_BRIGHTNESS) in (None, self._brightness)):
+            return
+        if self._device_type == "glowdim":
+            ha_brightness = kwargs.get(ATTR_BRIGHTNESS)
+            if ha_brightness is not None:
+                self._brightness = ha_brightness
+            # If self._brightness is None (e.g. first turn_on and not specified), default to full.
+            # self._brightness should have been initialized to 255 for glowdim.
+            current_ha_brightness = self._brightness if self._brightness is not None else 255
+            payload = _BRIGHTNESS_PAYLOAD[current_ha_brightness]
+            _LOGGER.debug("Turning on %s to brightness %s/255 -> payload %s", self._log_prefix, current_ha_brightness, payload)
+        else: # glowswitch
+            _LOGGER.debug("Turning on %s", self._log_prefix)
+            payload = _PAYLOAD_ON
+        await self._write_state(payload, True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the light off."""
+        if self._is_on is False:
+            return
+        _LOGGER.debug("Turning off %s", self._log_prefix)
+        await self._write_state(_PAYLOAD_OFF, False)
+
+    async def _write_state(self, payload: bytes, new_state: bool) -> None:
+        """Join an in-flight write for the same target state or start one."""
+        key = (payload, new_state)
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(self._do_write_state(payload, new_state))
+            self._inflight[key] = task
         try:
-            if self._device_type == "glowdim":
-                _LOGGER.debug(f"Turning off {self.name} ({self._device_type})")
-                await self._device.write_gatt("12345678-1234-5678-1234-56789abcdef1", "00")
-            else: # glowswitch
-                _LOGGER.debug(f"Turning off {self.name} ({self._device_type})")
-                await self._device.write_gatt("12345678-1234-5678-1234-56789abcdef1", "00")
-
-            self._is_on = False
-            self.async_write_ha_state()
-        except Exception as e:
-            _LOGGER.error(f"Error turning off light {self.name}: {e}")
+            # Shield so one cancelled service call cannot abort the write
+            # other concurrent callers are waiting on.
+            await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task and task.done():
+                self._inflight.pop(key, None)
+
+    async def _do_write_state(self, payload: bytes, new_state: bool) -> None:
+        """Write the command payload with backoff and optimistically update state."""
+        error: Exception | None = None
+        for delay in _RETRY_DELAYS:
+            if delay:
+                await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+            try:
+                await self._device.write_gatt(_CHAR_UUID, payload)
+            except BleakError as e:
+                # Transient link trouble; back off instead of hammering a
+                # congested connection event.
+                error = e
+                _LOGGER.debug("Write to light %s failed, backing off: %s", self.name, e)
+            except Exception as e:
+                _LOGGER.error("Error writing to light %s: %s", self.name, e)
+                return
+            else:
+                self._is_on = new_state
+                self.async_write_ha_state()
+                return
+        _LOGGER.error("Error writing to light %s: %s", self.name, error)
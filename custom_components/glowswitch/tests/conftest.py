@@ -0,0 +1,49 @@
+"""Shared fixtures for the glowswitch test suite."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Let hass load the glowswitch integration from custom_components."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def auto_mock_bluetooth(mock_bluetooth):
+    """Mock the bluetooth stack so setting it up never touches HCI/D-Bus."""
+    yield
+
+
+# A BLEDevice stand-in carries no per-test state, so one instance serves the
+# whole module. Only .address is read, so a SimpleNamespace is enough and
+# avoids Mock attribute dispatch entirely.
+
+
+@pytest.fixture(scope="module")
+def mock_ble_device():
+    """Shared BLE device stand-in; immutable across tests."""
+    return SimpleNamespace(address="test_address")
+
+
+@pytest.fixture
+def mock_bleak_client():
+    """A connected-looking BleakClient mock with no resolved services."""
+    client = MagicMock()
+    client.services = []
+    client.write_gatt_char = AsyncMock()
+    client.read_gatt_char = AsyncMock(return_value=b"\x00")
+    client.disconnect = AsyncMock()
+    return client
+
+
+@pytest.fixture
+def mock_establish_connection(mock_bleak_client):
+    """Patch establish_connection once per test, yielding the patched mock."""
+    with patch(
+        "custom_components.glowswitch.generic_bt_api.device.establish_connection",
+        AsyncMock(return_value=mock_bleak_client),
+    ) as mock_establish:
+        yield mock_establish
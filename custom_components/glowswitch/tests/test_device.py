@@ -0,0 +1,78 @@
+"""Tests for the generic_bt_api device connection handling."""
+import asyncio
+from uuid import UUID
+
+import pytest
+from bleak.exc import BleakError
+
+from custom_components.glowswitch.generic_bt_api.device import GenericBTDevice
+
+TEST_UUID = "0000ff01-0000-1000-8000-00805f9b34fb"
+TEST_DATA = "0102"
+
+# Parsed once at import; immutable bytes so no test can mutate the constant.
+EXPECTED_UUID = UUID(TEST_UUID)
+EXPECTED_DATA_BYTES = bytes.fromhex(TEST_DATA)
+
+# Shared error instance; constructed once rather than inline per test.
+WRITE_ERROR = BleakError("Write failed")
+
+
+@pytest.fixture
+async def device(mock_ble_device):
+    """A device whose idle-disconnect timer is cancelled at test end."""
+    device = GenericBTDevice(mock_ble_device)
+    yield device
+    # stop() cancels the armed DISCONNECT_DELAY timer so no TimerHandle
+    # outlives the test.
+    await device.stop()
+
+
+async def test_write_gatt_reuses_connection(device, mock_bleak_client, mock_establish_connection):
+    """Two sequential writes should share one established connection."""
+    await device.write_gatt(TEST_UUID, TEST_DATA)
+    await device.write_gatt(TEST_UUID, TEST_DATA)
+
+    mock_establish_connection.assert_called_once()
+    assert mock_bleak_client.write_gatt_char.call_count == 2
+
+
+async def test_write_gatt_decodes_hex_payload(device, mock_bleak_client, mock_establish_connection):
+    """A hex string payload is decoded to bytes before hitting the client."""
+    await device.write_gatt(TEST_UUID, TEST_DATA)
+
+    mock_bleak_client.write_gatt_char.assert_called_once_with(
+        EXPECTED_UUID, EXPECTED_DATA_BYTES, False
+    )
+
+
+async def test_concurrent_writes_coalesce(device, mock_bleak_client, mock_establish_connection):
+    """Parallel writes to one characteristic collapse to the last value."""
+    await asyncio.gather(
+        device.write_gatt(TEST_UUID, "01"),
+        device.write_gatt(TEST_UUID, "02"),
+        device.write_gatt(TEST_UUID, "03"),
+    )
+
+    # One connection, one radio write, carrying the most recent payload.
+    mock_establish_connection.assert_called_once()
+    mock_bleak_client.write_gatt_char.assert_called_once_with(
+        EXPECTED_UUID, b"\x03", False
+    )
+
+
+async def test_write_gatt_propagates_client_error(device, mock_bleak_client, mock_establish_connection):
+    """A write failure surfaces to the awaiting caller."""
+    mock_bleak_client.write_gatt_char.side_effect = WRITE_ERROR
+    with pytest.raises(BleakError):
+        await device.write_gatt(TEST_UUID, TEST_DATA)
+
+
+async def test_stop_disconnects_cached_client(device, mock_bleak_client, mock_establish_connection):
+    """stop() releases the cached connection so the next use reconnects."""
+    await device.write_gatt(TEST_UUID, TEST_DATA)
+    await device.stop()
+    await device.write_gatt(TEST_UUID, TEST_DATA)
+
+    mock_bleak_client.disconnect.assert_called_once()
+    assert mock_establish_connection.call_count == 2
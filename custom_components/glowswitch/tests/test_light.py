@@ -1,11 +1,18 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from bleak.exc import BleakError
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.light import ColorMode, LightEntityFeature, ATTR_BRIGHTNESS # Added ColorMode
 
-from custom_components.glowswitch.light import GenericBTLight, async_setup_entry
+from custom_components.glowswitch.light import (
+    _BRIGHTNESS_PAYLOAD,
+    _CHAR_UUID,
+    _RETRY_DELAYS,
+    GenericBTLight,
+    async_setup_entry,
+)
 from custom_components.glowswitch.coordinator import GenericBTCoordinator
 from custom_components.glowswitch.const import DOMAIN
 
@@ -23,6 +30,10 @@ def mock_coordinator():
     coordinator = MagicMock(spec=GenericBTCoordinator) # Updated spec
     coordinator.device = AsyncMock() # Mocks the GenericBTDevice
     coordinator.device.write_gatt = AsyncMock()
+    # ble_device is an instance attribute, so the spec'd mock needs it set
+    # explicitly for the entity base class to read .address.
+    coordinator.ble_device = MagicMock()
+    coordinator.ble_device.address = "test_address"
     coordinator.device_info = {
         "connections": {("bluetooth", "test_address")},
         "name": "Test GlowSwitch Device"
@@ -59,13 +70,13 @@ async def test_light_turn_on_glowswitch(mock_coordinator, mock_config_entry):
     """Test the turn_on method for a glowswitch device."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowswitch"}
     light = GenericBTLight(mock_coordinator, mock_config_entry)
-    light.async_write_ha_state = AsyncMock()
+    light.async_write_ha_state = MagicMock()
 
     assert light.is_on is None
     await light.async_turn_on()
 
     mock_coordinator.device.write_gatt.assert_called_once_with(
-        "12345678-1234-5678-1234-56789abcdef1", "01"
+        _CHAR_UUID, b"\x01"
     )
     assert light.is_on is True
     light.async_write_ha_state.assert_called_once()
@@ -74,18 +85,59 @@ async def test_light_turn_off_glowswitch(mock_coordinator, mock_config_entry):
     """Test the turn_off method for a glowswitch device."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowswitch"}
     light = GenericBTLight(mock_coordinator, mock_config_entry)
-    light.async_write_ha_state = AsyncMock()
+    light.async_write_ha_state = MagicMock()
 
     light._is_on = True 
     assert light.is_on is True
     await light.async_turn_off()
 
     mock_coordinator.device.write_gatt.assert_called_once_with(
-        "12345678-1234-5678-1234-56789abcdef1", "00"
+        _CHAR_UUID, b"\x00"
     )
     assert light.is_on is False
     light.async_write_ha_state.assert_called_once()
 
+async def test_turn_on_when_already_on_skips_write(mock_coordinator, mock_config_entry):
+    """A redundant turn_on skips the BLE round trip entirely."""
+    mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowswitch"}
+    light = GenericBTLight(mock_coordinator, mock_config_entry)
+    light._is_on = True
+
+    await light.async_turn_on()
+
+    mock_coordinator.device.write_gatt.assert_not_called()
+
+async def test_turn_off_when_already_off_skips_write(mock_coordinator, mock_config_entry):
+    """A redundant turn_off skips the BLE round trip entirely."""
+    mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowswitch"}
+    light = GenericBTLight(mock_coordinator, mock_config_entry)
+    light._is_on = False
+
+    await light.async_turn_off()
+
+    mock_coordinator.device.write_gatt.assert_not_called()
+
+async def test_light_write_backoff_schedule(mock_coordinator, mock_config_entry):
+    """Transient BLE errors back off per _RETRY_DELAYS with bounded jitter."""
+    mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowswitch"}
+    light = GenericBTLight(mock_coordinator, mock_config_entry)
+    light.async_write_ha_state = MagicMock()
+    # Fail twice transiently, then succeed on the third attempt.
+    mock_coordinator.device.write_gatt.side_effect = [
+        BleakError("busy"), BleakError("busy"), None
+    ]
+
+    # Patch sleep so the test asserts the schedule without waiting it out.
+    with patch("custom_components.glowswitch.light.asyncio.sleep", AsyncMock()) as mock_sleep:
+        await light.async_turn_on()
+
+    delays = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(delays) == 2  # the first attempt carries no delay
+    for delay, base in zip(delays, _RETRY_DELAYS[1:]):
+        assert base <= delay <= base * 1.1  # jitter adds at most 10%
+    assert light.is_on is True
+    assert mock_coordinator.device.write_gatt.call_count == 3
+
 def test_light_is_on_initial_glowswitch(mock_coordinator, mock_config_entry):
     """Test the is_on property initial state for a glowswitch."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowswitch"}
@@ -103,6 +155,11 @@ def test_light_properties_glowswitch(mock_coordinator, mock_config_entry):
     assert light.supported_color_modes == {ColorMode.ONOFF}
     assert light.color_mode == ColorMode.ONOFF
 
+@pytest.mark.parametrize(("ha_brightness", "device_value"), [(0, 0), (77, 30), (128, 50), (255, 100)])
+def test_brightness_payload_table(ha_brightness, device_value):
+    """The precomputed HA->device brightness table matches the scaling formula."""
+    assert _BRIGHTNESS_PAYLOAD[ha_brightness] == bytes([device_value])
+
 # --- Tests for "glowdim" device type ---
 
 def test_light_properties_glowdim(mock_coordinator, mock_config_entry):
@@ -122,13 +179,13 @@ async def test_light_turn_on_glowdim_with_brightness(mock_coordinator, mock_conf
     """Test turning on a glowdim device with specified brightness."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowdim"}
     light = GenericBTLight(mock_coordinator, mock_config_entry)
-    light.async_write_ha_state = AsyncMock()
+    light.async_write_ha_state = MagicMock()
 
     await light.async_turn_on(**{ATTR_BRIGHTNESS: 128})
 
-    # HA 128 -> Device (128/255 * 100) = 50.196... -> rounded to 50. 50 decimal is "32" hex.
+    # HA 128 -> Device (128/255 * 100) = 50.196... -> rounded to 50. device payload is the single byte 0x32.
     mock_coordinator.device.write_gatt.assert_called_once_with(
-        "12345678-1234-5678-1234-56789abcdef1", "32"
+        _CHAR_UUID, b"\x32"
     )
     assert light.is_on is True
     assert light.brightness == 128
@@ -138,14 +195,14 @@ async def test_light_turn_on_glowdim_without_brightness_initial(mock_coordinator
     """Test turning on a glowdim device without specified brightness (initial call)."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowdim"}
     light = GenericBTLight(mock_coordinator, mock_config_entry)
-    light.async_write_ha_state = AsyncMock()
+    light.async_write_ha_state = MagicMock()
 
     # Initial brightness is 255, so device value should be 100
     await light.async_turn_on()
 
-    # Initial brightness is 255 (HA), device value 100, hex "64"
+    # Initial brightness is 255 (HA), device value 100, payload 0x64
     mock_coordinator.device.write_gatt.assert_called_once_with(
-        "12345678-1234-5678-1234-56789abcdef1", "64"
+        _CHAR_UUID, b"\x64"
     )
     assert light.is_on is True
     assert light.brightness == 255 # Stays at initial full brightness
@@ -155,15 +212,15 @@ async def test_light_turn_on_glowdim_without_brightness_after_set(mock_coordinat
     """Test turning on a glowdim device without brightness after it was previously set."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowdim"}
     light = GenericBTLight(mock_coordinator, mock_config_entry)
-    light.async_write_ha_state = AsyncMock()
+    light.async_write_ha_state = MagicMock()
 
     # Set an initial brightness
     await light.async_turn_on(**{ATTR_BRIGHTNESS: 77}) # HA 77 -> Device (77/255 * 100) = 30.19 -> 30
     assert light.is_on is True
     assert light.brightness == 77
-    # HA 77 -> Device (77/255 * 100) = 30.19 -> 30. 30 decimal is "1e" hex.
+    # HA 77 -> Device (77/255 * 100) = 30.19 -> 30. device payload is the single byte 0x1e.
     mock_coordinator.device.write_gatt.assert_called_with(
-        "12345678-1234-5678-1234-56789abcdef1", "1e"
+        _CHAR_UUID, b"\x1e"
     )
     light.async_write_ha_state.assert_called_once()
 
@@ -175,9 +232,9 @@ async def test_light_turn_on_glowdim_without_brightness_after_set(mock_coordinat
     # Turn on again without specifying brightness
     await light.async_turn_on()
 
-    # Should use the previously set brightness (77 HA -> 30 device -> "1e" hex)
+    # Should use the previously set brightness (77 HA -> 30 device -> payload 0x1e)
     mock_coordinator.device.write_gatt.assert_called_once_with(
-        "12345678-1234-5678-1234-56789abcdef1", "1e"
+        _CHAR_UUID, b"\x1e"
     )
     assert light.is_on is True
     assert light.brightness == 77 # Brightness remains as previously set
@@ -188,7 +245,7 @@ async def test_light_turn_off_glowdim(mock_coordinator, mock_config_entry):
     """Test turning off a glowdim device."""
     mock_config_entry.data = {**MOCK_CONFIG_ENTRY_DATA, "device_type": "glowdim"}
     light = GenericBTLight(mock_coordinator, mock_config_entry)
-    light.async_write_ha_state = AsyncMock()
+    light.async_write_ha_state = MagicMock()
 
     # Set initial state to on for testing turn_off
     light._is_on = True
@@ -197,9 +254,9 @@ async def test_light_turn_off_glowdim(mock_coordinator, mock_config_entry):
 
     await light.async_turn_off()
 
-    # Turn off command for glowdim is "00"
+    # Turn off command for glowdim is the single byte 0x00
     mock_coordinator.device.write_gatt.assert_called_once_with(
-        "12345678-1234-5678-1234-56789abcdef1", "00"
+        _CHAR_UUID, b"\x00"
     )
     assert light.is_on is False
     # Brightness should remain as it was, for next turn_on